@@ -1,14 +1,22 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 import re
 import os
 import io
-from PIL import Image
+import hashlib
+import threading
+import struct
+import tempfile
+import zlib
+from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageOps
 from wordcloud import WordCloud
-from collections import Counter
+import numpy as np
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 import sys
 from langdetect import detect
@@ -55,11 +63,15 @@ def ensure_nltk_data():
         logger.info("NLTK data downloaded successfully.")
 
 # Load stopwords for different languages
+@lru_cache(maxsize=None)
 def load_stopwords():
     """Load stopwords for different languages.
     
+    The result is built once and cached, so it is returned read-only.
+    
     Returns:
-        dict: Dictionary with language codes as keys and sets of stopwords as values.
+        MappingProxyType: Read-only mapping with language codes as keys and
+            frozensets of stopwords as values.
     """
     stopword_dict = {}
     
@@ -159,10 +171,15 @@ def load_stopwords():
         'ꯑꯩꯖꯣꯡꯅꯗꯤ', 'ꯑꯩꯖꯣꯡꯅꯗꯨ', 'ꯑꯩꯖꯣꯡꯅꯥ', 'ꯑꯩꯖꯣꯡꯅꯥꯁꯨ', 'ꯑꯩꯖꯣꯡꯅꯥꯗꯤ', 'ꯑꯩꯖꯣꯡꯅꯥꯗꯨ', 'ꯑꯩꯖꯣꯡꯁꯤ', 'ꯑꯩꯖꯣꯡꯁꯨ'
     }
     
-    # Bodo stopwords (currently empty, can be expanded)
-    stopword_dict['bodo'] = set()
+    # Bodo stopwords (minimal curated list; compared by stem when inflections are merged)
+    stopword_dict['bodo'] = {
+        'आरो', 'एबा', 'बे', 'बेयो', 'बेनि', 'बि', 'बियो', 'बिनि', 'बिखौ', 'बिसोर', 'आं', 'आंनि', 'आंखौ', 
+        'नों', 'नोंनि', 'नोंखौ', 'जों', 'जोंनि', 'जोंखौ', 'नोंसोर', 'जाय', 'दं', 'नंगौ', 'नङा', 'गैया', 
+        'जेब्ला', 'अब्ला', 'दा', 'मानोना', 'होनना', 'थाखाय', 'जेरै', 'बेबादि', 'मोनसे', 'सोर', 'मा', 'बबे', 
+        'बो', 'सिम', 'आव', 'खौ', 'नि', 'फ्राय', 'होयो', 'मावो'
+    }
     
-    return stopword_dict
+    return MappingProxyType({lang: frozenset(words) for lang, words in stopword_dict.items()})
 
 # Clean text by removing punctuation and normalizing spaces
 def clean_text(text):
@@ -256,13 +273,265 @@ def tokenize_text(text, lang):
         # Fallback to simple regex tokenization
         return re.findall(r'\b\w+\b', text)
 
+# Suffix-stripping rules for inflected Indic languages. Each language lists its
+# case markers, plurals, classifiers and common verb endings; max_passes bounds
+# how many suffixes may be peeled off one token (agglutinative languages stack
+# several, e.g. Manipuri ꯑꯗꯣꯝ + ꯗꯒꯤ + ꯁꯨ). min_stem_syllables is the shortest
+# stem that may be left, and schwa_deletion marks scripts where a final bare
+# consonant is silent (कल is one syllable), so it is not counted.
+SUFFIX_RULES = {
+    'hindi': {
+        'suffixes': [
+            'ों', 'ें', 'ीं', 'ां', 'ाँ', 'ो', 'े', 'ी', 'ि', 'ा', 'ू', 'ु',
+            'ने', 'नी', 'ना', 'ते', 'ती', 'ता', 'तीं', 'कर', 'ाकर',
+            'ाने', 'ाना', 'ाते', 'ाती', 'ाता', 'ाया', 'ाई', 'ाए', 'ाओ', 'िए',
+            'ाओं', 'ाएं', 'ाएँ', 'ुओं', 'ुएं', 'ियों', 'ियां', 'ियाँ',
+            'ेगा', 'ेगी', 'ेंगे', 'ोगे', 'ोगी', 'ूंगा', 'ूँगा', 'ाइए', 'ाईं'
+        ],
+        'max_passes': 1,
+        'min_stem_syllables': 2,
+        'schwa_deletion': True
+    },
+    'assamese': {
+        'suffixes': [
+            'ৰ', 'ক', 'ত', 'ে', 'ৰে', 'েৰে', 'লৈ', 'তে', 'টো', 'টি', 'টা', 'খন',
+            'জন', 'জনী', 'বোৰ', 'বিলাক', 'সকল', 'হঁত', 'লোক', 'খিনি', 'গৰাকী',
+            'িছে', 'িছিল', 'িব', 'িলে', 'িলো', 'িলোঁ'
+        ],
+        'max_passes': 3,
+        'min_stem_syllables': 2,
+        'schwa_deletion': True
+    },
+    'manipuri': {
+        'suffixes': [
+            'ꯒꯤ', 'ꯀꯤ', 'ꯒꯤꯗꯝꯛ', 'ꯒꯤꯗꯃꯛ', 'ꯗꯒꯤ', 'ꯇꯒꯤ', 'ꯗ', 'ꯇ', 'ꯅ', 'ꯅꯥ',
+            'ꯁꯨ', 'ꯗꯤ', 'ꯇꯤ', 'ꯗꯨ', 'ꯇꯨ', 'ꯁꯤ', 'ꯕꯨ', 'ꯄꯨ', 'ꯁꯤꯡ', 'ꯈꯣꯢ',
+            'ꯈꯣꯏ', 'ꯒꯥ', 'ꯀꯥ', 'ꯒꯨꯝꯕ'
+        ],
+        'max_passes': 4,
+        'min_stem_syllables': 1,
+        'schwa_deletion': False
+    },
+    'bodo': {
+        'suffixes': [
+            'ा', 'खौ', 'नि', 'ाव', 'आव', 'याव', 'निफ्राय', 'फ्राय', 'जों', 'फोर', 'सिम',
+            'थिंहो', 'बो'
+        ],
+        'max_passes': 3,
+        'min_stem_syllables': 2,
+        'schwa_deletion': True
+    }
+}
+
+# Stems shorter than this (in code points) are never produced
+MIN_STEM_LENGTH = 2
+
+# Viramas join the following consonant into the same syllable
+VIRAMAS = {'\u094D', '\u09CD', '\uABED'}
+
+# Nuktas modify a consonant without adding a vowel
+NUKTAS = {'\u093C', '\u09BC'}
+
+# Independent vowel letters (Devanagari, Bengali-Assamese)
+INDEPENDENT_VOWELS = regex.compile(r'[\u0904-\u0914\u0960\u0961\u0985-\u0994\u09E0\u09E1]')
+
+# Meetei Mayek final consonants (lonsum) close the previous syllable
+MEETEI_LONSUM = regex.compile(r'[\uABDB-\uABE2]')
+
+# Number of distinct (token, language) pairs kept in the stemming memo
+STEM_CACHE_SIZE = 65536
+
+# Marks the end of a suffix inside a compiled trie
+_SUFFIX_END = None
+
+# Compile a suffix list into a reversed-character trie
+def compile_suffix_trie(suffixes):
+    """Compile suffixes into a trie keyed on characters read right to left.
+    
+    Args:
+        suffixes (list): List of suffix strings.
+        
+    Returns:
+        dict: Nested dictionary trie; nodes ending a suffix hold the _SUFFIX_END key.
+    """
+    trie = {}
+    for suffix in suffixes:
+        node = trie
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[_SUFFIX_END] = True
+    return trie
+
+# Suffix tries are compiled once at import time
+_SUFFIX_TRIES = {lang: compile_suffix_trie(rules['suffixes']) for lang, rules in SUFFIX_RULES.items()}
+
+# Character classes for syllable counting, as one-letter codes: virama (v),
+# nukta (n), vowel sign or other mark (m), final consonant (f), independent
+# vowel (o) and consonant or other letter (c)
+class _SyllableCodes(dict):
+    """Translation table from code points to syllable codes, filled on first use."""
+    
+    def __missing__(self, code):
+        char = chr(code)
+        if char in VIRAMAS:
+            kind = 'v'
+        elif char in NUKTAS:
+            kind = 'n'
+        elif unicodedata.category(char).startswith('M'):
+            kind = 'm'
+        elif MEETEI_LONSUM.match(char):
+            kind = 'f'
+        elif INDEPENDENT_VOWELS.match(char):
+            kind = 'o'
+        else:
+            kind = 'c'
+        self[code] = kind
+        return kind
+
+_SYLLABLE_CODES = _SyllableCodes()
+
+# A final consonant without a vowel sign that is not part of a conjunct
+_BARE_FINAL = regex.compile(r'(?<!v)c(?:[nf]|v+(?=n|$))*$')
+
+# Count the syllables of a word
+def count_syllables(word, schwa_deletion=False):
+    """Count the syllables (aksharas) of a word in an Indic script.
+    
+    Vowel signs, other marks, final consonants and consonants joined by a virama
+    belong to the preceding syllable.
+    
+    Args:
+        word (str): Word to count.
+        schwa_deletion (bool): Do not count a final consonant without a vowel
+            sign, whose inherent vowel is silent. A final conjunct keeps its
+            vowel and is still counted.
+        
+    Returns:
+        int: Number of syllables.
+    """
+    # Every consonant or vowel starts a syllable unless a virama joins it
+    codes = word.translate(_SYLLABLE_CODES)
+    syllables = codes.count('c') + codes.count('o') - codes.count('vc') - codes.count('vo')
+    
+    if schwa_deletion and syllables > 1 and _BARE_FINAL.search(codes):
+        syllables -= 1
+    
+    return syllables
+
+# Strip the longest matching suffix from a token
+def _strip_suffix(token, trie, rules):
+    """Strip the longest suffix in the trie that leaves a long enough stem.
+    
+    Stems must keep at least MIN_STEM_LENGTH characters and the language's
+    min_stem_syllables syllables.
+    
+    Args:
+        token (str): Token to strip.
+        trie (dict): Compiled suffix trie.
+        rules (dict): Suffix rules of the language.
+        
+    Returns:
+        str: Token without its suffix, or the token unchanged if nothing matched.
+    """
+    node = trie
+    candidates = []
+    for i in range(len(token) - 1, MIN_STEM_LENGTH - 1, -1):
+        node = node.get(token[i])
+        if node is None:
+            break
+        if _SUFFIX_END in node:
+            candidates.append(i)
+    
+    # Longest suffix first
+    for stem_length in reversed(candidates):
+        stem = token[:stem_length]
+        if count_syllables(stem, rules['schwa_deletion']) >= rules['min_stem_syllables']:
+            return stem
+    return token
+
+# Reduce a token to its stem
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem_token(token, lang):
+    """Reduce a token to its stem by repeatedly stripping inflectional suffixes.
+    
+    Results are memoized per token type, so repeated words cost a single lookup.
+    
+    Args:
+        token (str): Token to stem.
+        lang (str): Language code.
+        
+    Returns:
+        str: Stem of the token, or the token itself if the language has no rules.
+    """
+    trie = _SUFFIX_TRIES.get(lang)
+    if trie is None:
+        return token
+    
+    rules = SUFFIX_RULES[lang]
+    for _ in range(rules['max_passes']):
+        stem = _strip_suffix(token, trie, rules)
+        if stem == token:
+            break
+        token = stem
+    
+    return token
+
+# Merge inflected forms of the same word
+def normalize_tokens(tokens, lang):
+    """Merge inflected forms by mapping every token to one surface form per stem.
+    
+    Tokens sharing a stem are replaced by the most frequent surface form of that
+    stem, so counts are merged while word clouds still show readable words.
+    
+    Args:
+        tokens (list): List of tokens.
+        lang (str): Language code.
+        
+    Returns:
+        list: List of normalized tokens.
+    """
+    if not tokens:
+        return []
+    
+    if lang not in SUFFIX_RULES:
+        return list(tokens)
+    
+    # Stem each token type once and pick the most frequent surface form per stem
+    # (first seen wins ties)
+    type_counts = Counter(tokens)
+    stems = {}
+    representatives = {}
+    for token, count in type_counts.items():
+        stem = stem_token(token, lang)
+        stems[token] = stem
+        if stem not in representatives or count > type_counts[representatives[stem]]:
+            representatives[stem] = token
+    
+    token_map = {token: representatives[stem] for token, stem in stems.items()}
+    return list(map(token_map.__getitem__, tokens))
+
+# Get stopwords for a language reduced to their stems
+@lru_cache(maxsize=None)
+def _stemmed_stopwords(lang):
+    """Get the stopwords for a language reduced to their stems.
+    
+    Args:
+        lang (str): Language code.
+        
+    Returns:
+        frozenset: Set of stemmed stopwords.
+    """
+    return frozenset(stem_token(word, lang) for word in load_stopwords().get(lang, frozenset()))
+
 # Filter stopwords from tokens
-def filter_stopwords(tokens, lang):
+def filter_stopwords(tokens, lang, stemmed=False):
     """Filter stopwords from tokens.
     
     Args:
         tokens (list): List of tokens.
         lang (str): Language code ('english', 'hindi', 'assamese', 'manipuri').
+        stemmed (bool): Match stopwords by stem, so inflected forms missing from
+            the stopword list are removed too.
         
     Returns:
         list: List of tokens with stopwords removed.
@@ -270,9 +539,15 @@ def filter_stopwords(tokens, lang):
     if not tokens:
         return []
     
+    if stemmed and lang in SUFFIX_RULES:
+        # Stem each token type once, then keep the tokens of the surviving types
+        lang_stopwords = _stemmed_stopwords(lang)
+        kept = {token for token in set(tokens) if stem_token(token, lang) not in lang_stopwords and len(token) >= 2}
+        return list(filter(kept.__contains__, tokens))
+    
     # Get stopwords for the language
     stopword_dict = load_stopwords()
-    lang_stopwords = stopword_dict.get(lang, set())
+    lang_stopwords = stopword_dict.get(lang, frozenset())
     
     # Filter out stopwords and tokens with length < 2
     filtered_tokens = [token for token in tokens if token not in lang_stopwords and len(token) >= 2]
@@ -327,8 +602,168 @@ def get_font_path(lang):
     logger.warning(f"Font for {lang} not found at {font_path}. Using default.")
     return None
 
+# Shapes bundled with the app, drawn at the requested canvas size
+BUNDLED_SHAPES = ['circle', 'heart', 'star', 'diamond']
+
+# Number of distinct (mask, size) pairs kept in the mask cache
+MASK_CACHE_SIZE = 16
+
+# Binarized masks by (shape name or upload digest, width, height), least recently used first
+_MASK_CACHE = OrderedDict()
+_MASK_CACHE_LOCK = threading.Lock()
+
+# Color of the optional mask contour
+CONTOUR_COLOR = '#7E6551'
+
+# Draw a bundled shape
+def draw_bundled_shape(name, width, height):
+    """Draw a bundled shape in black on a white canvas.
+    
+    Args:
+        name (str): Shape name from BUNDLED_SHAPES.
+        width (int): Canvas width.
+        height (int): Canvas height.
+        
+    Returns:
+        PIL.Image.Image: Greyscale image of the shape.
+    """
+    img = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(img)
+    
+    # Fit the shape in a centered square
+    size = min(width, height)
+    left, top = (width - size) / 2, (height - size) / 2
+    cx, cy, r = width / 2, height / 2, size / 2
+    
+    if name == 'circle':
+        draw.ellipse([left, top, left + size, top + size], fill=0)
+    elif name == 'heart':
+        points = []
+        for i in range(360):
+            t = np.radians(i)
+            x = 16 * np.sin(t) ** 3
+            y = 13 * np.cos(t) - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t)
+            points.append((cx + x * r / 17, cy - y * r / 17 - r / 12))
+        draw.polygon(points, fill=0)
+    elif name == 'star':
+        points = []
+        for i in range(10):
+            radius = r if i % 2 == 0 else r * 0.45
+            angle = np.radians(-90 + i * 36)
+            points.append((cx + radius * np.cos(angle), cy + radius * np.sin(angle)))
+        draw.polygon(points, fill=0)
+    elif name == 'diamond':
+        draw.polygon([(cx, top), (left + size, cy), (cx, top + size), (left, cy)], fill=0)
+    else:
+        raise ValueError(f"Unknown shape: {name}")
+    
+    return img
+
+# Binarize a mask image
+def binarize_mask_image(img, width, height):
+    """Fit a mask image into the canvas and binarize it.
+    
+    Transparent and light pixels are masked out; dark pixels are where words go.
+    
+    Args:
+        img (PIL.Image.Image): Mask image.
+        width (int): Canvas width.
+        height (int): Canvas height.
+        
+    Returns:
+        numpy.ndarray: Array of shape (height, width) in WordCloud's mask format,
+            255 where masked out and 0 where words may be drawn.
+    """
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    
+    img = ImageOps.pad(img.convert('L'), (width, height), color=255)
+    return np.where(np.asarray(img) >= 128, 255, 0).astype(np.uint8)
+
+# Build the cached mask for a shape and canvas size
+def get_shape_mask(source, width, height):
+    """Get the binarized mask for a shape at a canvas size.
+    
+    Results are cached per (shape, width, height), so repeated renders of the
+    same shape skip decoding, fitting and binarizing the mask image. Uploads are
+    keyed by a digest of their bytes, so the cache never holds on to them.
+    
+    Args:
+        source (str or bytes): Bundled shape name or uploaded image bytes.
+        width (int): Canvas width.
+        height (int): Canvas height.
+        
+    Returns:
+        numpy.ndarray: Read-only mask, 255 where masked out and 0 where words may be drawn.
+    """
+    if isinstance(source, str):
+        key = (source, width, height)
+    else:
+        key = (hashlib.sha256(source).hexdigest(), width, height)
+    
+    with _MASK_CACHE_LOCK:
+        mask = _MASK_CACHE.get(key)
+        if mask is not None:
+            _MASK_CACHE.move_to_end(key)
+            return mask
+    
+    if isinstance(source, str):
+        img = draw_bundled_shape(source, width, height)
+    else:
+        img = Image.open(io.BytesIO(source))
+    
+    mask = binarize_mask_image(img, width, height)
+    mask.flags.writeable = False
+    logger.info(f"Shape mask built for {width}x{height}")
+    
+    with _MASK_CACHE_LOCK:
+        _MASK_CACHE[key] = mask
+        while len(_MASK_CACHE) > MASK_CACHE_SIZE:
+            _MASK_CACHE.popitem(last=False)
+    
+    return mask
+
+# Empty the mask cache
+def clear_shape_masks():
+    """Remove all cached shape masks."""
+    with _MASK_CACHE_LOCK:
+        _MASK_CACHE.clear()
+
+# Create a configured wordcloud
+def create_wordcloud(lang, width=800, height=400, mask=None, contour_width=0, scale=1):
+    """Create a wordcloud with the app's styling.
+    
+    Args:
+        lang (str): Language code.
+        width (int): Width of the layout grid.
+        height (int): Height of the layout grid.
+        mask (str or bytes): Bundled shape name or uploaded image bytes to shape
+            the wordcloud. None for a plain rectangle.
+        contour_width (int): Width of the shape contour, 0 for none.
+        scale (float): Factor between the layout grid and the rendered image.
+        
+    Returns:
+        WordCloud: Wordcloud ready for generate_from_frequencies.
+    """
+    return WordCloud(
+        width=width,
+        height=height,
+        mask=get_shape_mask(mask, width, height) if mask is not None else None,
+        scale=scale,
+        contour_width=contour_width if mask is not None else 0,
+        contour_color=CONTOUR_COLOR,
+        background_color='#FDF4DC',
+        font_path=get_font_path(lang),
+        min_font_size=10,
+        max_font_size=150,
+        colormap='copper',
+        collocations=False
+    )
+
 # Generate wordcloud image
-def generate_wordcloud_image(tokens, lang, width=800, height=400):
+def generate_wordcloud_image(tokens, lang, width=800, height=400, mask=None, contour_width=0):
     """Generate wordcloud image.
     
     Args:
@@ -336,6 +771,9 @@ def generate_wordcloud_image(tokens, lang, width=800, height=400):
         lang (str): Language code.
         width (int): Width of the wordcloud image.
         height (int): Height of the wordcloud image.
+        mask (str or bytes): Bundled shape name or uploaded image bytes to shape
+            the wordcloud. None for a plain rectangle.
+        contour_width (int): Width of the shape contour, 0 for none.
         
     Returns:
         bytes: Image bytes for the wordcloud.
@@ -344,20 +782,9 @@ def generate_wordcloud_image(tokens, lang, width=800, height=400):
         return None
     
     word_freq = Counter(tokens)
-    font_path = get_font_path(lang)
     
     try:
-        wordcloud = WordCloud(
-            width=width,
-            height=height,
-            background_color='#FDF4DC',
-            font_path=font_path,
-            min_font_size=10,
-            max_font_size=150,
-            colormap='copper',
-            collocations=False
-        )
-        
+        wordcloud = create_wordcloud(lang, width, height, mask, contour_width)
         wordcloud.generate_from_frequencies(word_freq)
         
         img = wordcloud.to_image()
@@ -365,13 +792,247 @@ def generate_wordcloud_image(tokens, lang, width=800, height=400):
         img.save(img_bytes, format='PNG')
         img_bytes.seek(0)
         
-        logger.info(f"WordCloud generated for {lang} with font: {font_path}")
+        logger.info(f"WordCloud generated for {lang} with font: {wordcloud.font_path}")
         return img_bytes
         
     except Exception as e:
         logger.error(f"Error generating wordcloud: {e}")
         return None
 
+# Poster sizes offered in the UI
+POSTER_SIZES = ['4000x2000', '8000x4000']
+
+# Pixel count of the layout grid for posters; matches the on-screen 800x400
+# wordcloud so posters keep its look and layout stays cheap at any output
+# size and aspect ratio
+POSTER_LAYOUT_PIXELS = 800 * 400
+
+# Default cap on memory used for poster layout and render buffers
+POSTER_MEMORY_LIMIT_MB = 256
+
+# Interval between resident memory samples during poster export
+RSS_SAMPLE_INTERVAL = 0.002
+
+# Get the resident set size of this process
+def current_rss_bytes():
+    """Get the resident set size of this process.
+    
+    Returns:
+        int: Resident memory in bytes, or None where /proc is not available.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class PeakMemory:
+    """Measure how far resident memory rises while the context is active.
+    
+    Resident memory is sampled on a background thread, so allocations shorter
+    than the sampling interval can be missed. The rise includes memory allocated
+    by other threads of the process meanwhile.
+    """
+    
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.baseline = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def _sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def __enter__(self):
+        self.baseline = self.peak = current_rss_bytes()
+        if self.baseline is not None:
+            self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.baseline is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+        return False
+    
+    @property
+    def peak_mb(self):
+        """float: Peak rise of resident memory in MB, or None if it could not be measured."""
+        if self.baseline is None:
+            return None
+        return (self.peak - self.baseline) / (1024 * 1024)
+
+# Write one PNG chunk
+def _write_png_chunk(f, chunk_type, data):
+    """Write one PNG chunk: length, type, data and CRC.
+    
+    Args:
+        f (file): Binary file open for writing.
+        chunk_type (bytes): Four-byte chunk type such as b'IHDR' or b'IDAT'.
+        data (bytes): Chunk data.
+        
+    Returns:
+        None
+    """
+    f.write(struct.pack('>I', len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+# Draw the shape contour onto one strip of a poster
+def _draw_contour_strip(strip, mask, scale, top, height, contour_width):
+    """Draw the mask contour onto a strip, matching WordCloud's contour at full resolution.
+    
+    Only the rows of the mask covering the strip (plus the blur margin) are
+    upscaled, so the full-size contour is never held in memory.
+    
+    Args:
+        strip (PIL.Image.Image): Strip of the poster, modified in place.
+        mask (numpy.ndarray): Mask at layout resolution, 255 where masked out.
+        scale (float): Factor between the layout grid and the poster.
+        top (int): First poster row of the strip.
+        height (int): Poster height.
+        contour_width (int): Width of the contour.
+    """
+    width, strip_height = strip.size
+    margin = int(np.ceil(contour_width / 10 * 3)) + 2
+    pad_top = min(margin, top)
+    pad_bottom = min(margin, height - top - strip_height)
+    box_top = (top - pad_top) / scale
+    box_bottom = min((top + strip_height + pad_bottom) / scale, mask.shape[0])
+    
+    mask_img = Image.fromarray(mask)
+    contour = mask_img.resize((width, strip_height + pad_top + pad_bottom), Image.BILINEAR,
+                              box=(0, box_top, mask.shape[1], box_bottom))
+    contour = contour.point(lambda v: 255 if v >= 128 else 0).filter(ImageFilter.FIND_EDGES)
+    contour = np.array(contour)
+    
+    # Make sure the poster borders are not drawn
+    contour[:, [0, -1]] = 0
+    if top == 0:
+        contour[0, :] = 0
+    if top + strip_height == height:
+        contour[-1, :] = 0
+    
+    contour = Image.fromarray(contour).filter(ImageFilter.GaussianBlur(radius=contour_width / 10))
+    contour = contour.crop((0, pad_top, width, pad_top + strip_height)).point(lambda v: 255 if v > 0 else 0)
+    strip.paste(CONTOUR_COLOR, (0, 0, width, strip_height), contour)
+
+# Export a poster-size wordcloud
+def export_wordcloud_poster(tokens, lang, path, width=8000, height=4000, mask=None, contour_width=0,
+                            max_memory_mb=POSTER_MEMORY_LIMIT_MB):
+    """Export a high-resolution wordcloud PNG with bounded memory.
+    
+    The layout is computed on a grid of at most POSTER_LAYOUT_PIXELS with the
+    poster's aspect ratio and scaled up, and the image is rendered in horizontal
+    strips that are compressed and written to disk as they are finished, so the
+    full poster is never held in memory.
+    
+    Args:
+        tokens (list): List of tokens.
+        lang (str): Language code.
+        path (str): Output PNG path.
+        width (int): Width of the poster.
+        height (int): Height of the poster.
+        mask (str or bytes): Bundled shape name or uploaded image bytes to shape
+            the wordcloud. None for a plain rectangle.
+        contour_width (int): Width of the shape contour at poster resolution, 0 for none.
+        max_memory_mb (float): Cap on memory for the layout grid and render buffers.
+            Strips are sized to fit it, and the measured peak is logged.
+        
+    Returns:
+        str: Path of the written poster, or None on failure.
+    """
+    if not tokens:
+        return None
+    
+    word_freq = Counter(tokens)
+    scale = max(1.0, (width * height / POSTER_LAYOUT_PIXELS) ** 0.5)
+    layout_width = max(1, round(width / scale))
+    layout_height = max(1, round(height / scale))
+    
+    # Layout grid (WordCloud's integral image, mask, greyscale canvas and
+    # temporaries) and a fixed reserve for fonts and the compressor, plus
+    # per-row render buffers (strip, its array copy and the filtered scanline,
+    # and the contour masks when drawn)
+    contour_width = contour_width if mask is not None else 0
+    layout_bytes = layout_width * layout_height * 24 + 16 * 1024 * 1024
+    row_bytes = width * (11 + (8 if contour_width else 0))
+    budget = max_memory_mb * 1024 * 1024 - layout_bytes
+    if budget < row_bytes:
+        logger.error(f"Memory limit of {max_memory_mb} MB is too low for a {width}x{height} poster")
+        return None
+    strip_height = int(min(height, budget // row_bytes))
+    
+    try:
+        with PeakMemory() as memory:
+            wordcloud = create_wordcloud(lang, layout_width, layout_height, mask, scale=scale)
+            wordcloud.generate_from_frequencies(word_freq)
+            
+            # Fonts and full-resolution bounding boxes of the placed words
+            scratch = ImageDraw.Draw(Image.new('L', (1, 1)))
+            fonts = {}
+            words = []
+            for (word, count), font_size, position, orientation, color in wordcloud.layout_:
+                key = (int(font_size * scale), orientation)
+                if key not in fonts:
+                    font = ImageFont.truetype(wordcloud.font_path, key[0])
+                    fonts[key] = ImageFont.TransposedFont(font, orientation=orientation)
+                pos = (int(position[1] * scale), int(position[0] * scale))
+                bbox = scratch.textbbox(pos, word, font=fonts[key])
+                words.append((word, pos, bbox, fonts[key], color))
+            
+            compressor = zlib.compressobj(6)
+            with open(path, 'wb') as f:
+                f.write(b'\x89PNG\r\n\x1a\n')
+                _write_png_chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+                
+                strips = 0
+                for top in range(0, height, strip_height):
+                    rows = min(strip_height, height - top)
+                    strip = Image.new('RGB', (width, rows), wordcloud.background_color)
+                    draw = ImageDraw.Draw(strip)
+                    for word, pos, bbox, font, color in words:
+                        if bbox[3] > top and bbox[1] < top + rows:
+                            draw.text((pos[0], pos[1] - top), word, fill=color, font=font)
+                    
+                    if contour_width:
+                        _draw_contour_strip(strip, wordcloud.mask, scale, top, height, contour_width)
+                    
+                    # Prefix every scanline with filter type 0 (None)
+                    scanlines = np.zeros((rows, width * 3 + 1), dtype=np.uint8)
+                    scanlines[:, 1:] = np.asarray(strip).reshape(rows, -1)
+                    del strip, draw
+                    
+                    data = compressor.compress(scanlines)
+                    if data:
+                        _write_png_chunk(f, b'IDAT', data)
+                    strips += 1
+                
+                _write_png_chunk(f, b'IDAT', compressor.flush())
+                _write_png_chunk(f, b'IEND', b'')
+        
+        estimated_mb = (layout_bytes + strip_height * row_bytes) / (1024 * 1024)
+        measured = f"{memory.peak_mb:.0f} MB" if memory.peak_mb is not None else "not measured"
+        logger.info(f"Poster {width}x{height} for {lang} written to {path} in {strips} strips "
+                    f"(layout {layout_width}x{layout_height}, peak {measured}, estimated "
+                    f"{estimated_mb:.0f} MB, of {max_memory_mb} MB limit)")
+        if memory.peak_mb is not None and memory.peak_mb > max_memory_mb:
+            logger.warning(f"Poster export used {memory.peak_mb:.0f} MB, above the {max_memory_mb} MB limit")
+        return path
+        
+    except Exception as e:
+        logger.error(f"Error exporting poster: {e}")
+        return None
+
 # Plot frequency bar chart
 def plot_frequency_bar(freq_list, lang='english'):
     """Plot frequency bar chart with proper font handling for Indic scripts.
@@ -388,7 +1049,10 @@ def plot_frequency_bar(freq_list, lang='english'):
     
     font_path = get_font_path(lang)
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Use a standalone Figure rather than pyplot so figures are not kept alive by
+    # pyplot's global registry and concurrent sessions do not share state
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
     
     words = [item[0] for item in freq_list]
     counts = [item[1] for item in freq_list]
@@ -407,8 +1071,8 @@ def plot_frequency_bar(freq_list, lang='english'):
     ax.set_ylabel('Frequency', color='#161616')
     ax.set_title('Word Frequency Distribution', color='#7E6551', fontproperties=font_prop)
     
-    plt.yticks(color='#161616')
-    plt.tight_layout()
+    ax.tick_params(axis='y', labelcolor='#161616')
+    fig.tight_layout()
     
     logger.info(f"Bar chart generated for {lang} with font: {font_path}")
     
@@ -465,6 +1129,40 @@ def setup_ui():
     # Number of top words to display
     top_n = st.slider("Number of top words to display:", min_value=5, max_value=50, value=20)
     
+    # Optional stem normalization for inflected languages
+    merge_inflections = st.checkbox(
+        "Merge inflected forms of the same word",
+        value=False,
+        disabled=selected_lang not in SUFFIX_RULES,
+        help="Strips case markers and other suffixes so inflections are counted together."
+    )
+    
+    # Wordcloud shape
+    shape_options = ['rectangle'] + BUNDLED_SHAPES + ['upload']
+    selected_shape = st.selectbox(
+        "Word cloud shape:",
+        shape_options,
+        format_func=lambda x: "Upload image" if x == 'upload' else x.capitalize()
+    )
+    mask_source = None
+    if selected_shape == 'upload':
+        mask_file = st.file_uploader(
+            "Mask image (words are placed on dark areas):",
+            type=['png', 'jpg', 'jpeg']
+        )
+        if mask_file is not None:
+            mask_source = mask_file.getvalue()
+    elif selected_shape != 'rectangle':
+        mask_source = selected_shape
+    show_contour = st.checkbox("Draw shape contour", value=False, disabled=mask_source is None)
+    
+    # High-resolution export
+    poster_size = st.selectbox(
+        "High-resolution export:",
+        [None] + POSTER_SIZES,
+        format_func=lambda x: "None" if x is None else f"Poster ({x.replace('x', ' x ')} px)"
+    )
+    
     # Generate button
     generate_button = st.button("Generate")
     
@@ -475,7 +1173,11 @@ def setup_ui():
             original_text = text_input
             cleaned_text = clean_text(text_input)
             tokens = tokenize_text(cleaned_text, selected_lang)
-            filtered_tokens = filter_stopwords(tokens, selected_lang)
+            use_stems = merge_inflections and selected_lang in SUFFIX_RULES
+            if use_stems:
+                filtered_tokens = filter_stopwords(normalize_tokens(tokens, selected_lang), selected_lang, stemmed=True)
+            else:
+                filtered_tokens = filter_stopwords(tokens, selected_lang)
             
             # Check if we have tokens after filtering
             if not filtered_tokens:
@@ -510,7 +1212,12 @@ def setup_ui():
             # Display wordcloud in second column
             with col2:
                 st.subheader("Word Cloud")
-                wordcloud_bytes = generate_wordcloud_image(filtered_tokens, selected_lang)
+                wordcloud_bytes = generate_wordcloud_image(
+                    filtered_tokens,
+                    selected_lang,
+                    mask=mask_source,
+                    contour_width=3 if show_contour else 0
+                )
                 if wordcloud_bytes:
                     st.image(wordcloud_bytes, caption="Word Cloud", use_container_width=True)
                     st.download_button(
@@ -521,6 +1228,35 @@ def setup_ui():
                     )
                 else:
                     st.warning("Could not generate wordcloud.")
+                
+                # Stream the poster to a temporary file instead of building it in memory
+                if poster_size:
+                    poster_width, poster_height = (int(n) for n in poster_size.split('x'))
+                    fd, poster_path = tempfile.mkstemp(suffix='.png')
+                    os.close(fd)
+                    try:
+                        with st.spinner("Rendering poster..."):
+                            exported = export_wordcloud_poster(
+                                filtered_tokens,
+                                selected_lang,
+                                poster_path,
+                                poster_width,
+                                poster_height,
+                                mask=mask_source,
+                                contour_width=(3 * poster_width // 800) if show_contour else 0
+                            )
+                        if exported:
+                            with open(poster_path, 'rb') as f:
+                                st.download_button(
+                                    label=f"Download Poster ({poster_size})",
+                                    data=f,
+                                    file_name=f"wordcloud_{selected_lang}_{poster_size}.png",
+                                    mime="image/png"
+                                )
+                        else:
+                            st.warning("Could not export poster.")
+                    finally:
+                        os.remove(poster_path)
 
             # Add diagnostics section
             with st.expander("Diagnostics Information"):
@@ -568,6 +1304,7 @@ def setup_ui():
                 st.write("**Technical Details:**")
                 st.write(f"Total tokens before filtering: {len(tokens)}")
                 st.write(f"Total tokens after filtering: {len(filtered_tokens)}")
+                st.write(f"Inflected forms merged: {'Yes' if use_stems else 'No'}")
                 st.write(f"Unique words: {len(set(filtered_tokens))}")
                 
         except Exception as e:
@@ -0,0 +1,89 @@
+"""Benchmark shaped wordcloud renders with and without the mask cache.
+
+Usage:
+    python benchmarks/bench_mask_cache.py [--sizes 400x200,800x400,1600x800] [--renders 5]
+
+For every canvas size, a bundled shape and an uploaded-style PNG mask are
+rendered repeatedly. Uncached runs clear the mask cache before each render, so
+the mask is drawn or decoded, fitted to the canvas and binarized every time.
+Mask preparation is also timed on its own.
+
+Only the binarized mask is cached. WordCloud builds its integral-image
+occupancy map inside generate_from_frequencies and then updates it as words
+are placed, so it cannot be supplied from a cache without overriding that
+method. Its setup cost is reported in its own column, as the share of every
+render that the mask cache cannot remove.
+"""
+import argparse
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from wordcloud.wordcloud import IntegralOccupancyMap
+
+from app import clean_text, clear_shape_masks, draw_bundled_shape, generate_wordcloud_image, get_shape_mask
+from samples import load_sample_texts
+
+def parse_sizes(value):
+    """Parse a comma-separated list of WIDTHxHEIGHT sizes."""
+    return [tuple(int(n) for n in size.split('x')) for size in value.split(',')]
+
+def uploaded_mask_bytes():
+    """Build PNG bytes standing in for an uploaded mask image."""
+    buf = io.BytesIO()
+    draw_bundled_shape('star', 1200, 1200).save(buf, format='PNG')
+    return buf.getvalue()
+
+def mean_ms(func, runs, clear_cache):
+    """Mean wall time of func in milliseconds."""
+    total = 0.0
+    for _ in range(runs):
+        if clear_cache:
+            clear_shape_masks()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / runs * 1000
+
+def occupancy_setup(mask):
+    """Build WordCloud's integral occupancy map for a mask, as every render does."""
+    height, width = mask.shape
+    IntegralOccupancyMap(height, width, mask == 255)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('400x200,800x400,1600x800,3200x1600'),
+                        help="Comma-separated canvas sizes.")
+    parser.add_argument('--renders', type=int, default=5, help="Renders per configuration.")
+    args = parser.parse_args()
+    
+    # Keep per-call logging out of the measurements
+    logging.getLogger('app').setLevel(logging.WARNING)
+    
+    tokens = clean_text(' '.join(load_sample_texts().values())).split() * 5
+    sources = {'heart': 'heart', 'upload': uploaded_mask_bytes()}
+    
+    print(f"{'mask':<7} {'size':>10} {'prep ms':>9} {'cached':>8} {'occupancy ms':>13} {'render ms':>10} "
+          f"{'cached':>8} {'speedup':>8}")
+    for width, height in args.sizes:
+        for name, source in sources.items():
+            prep = lambda: get_shape_mask(source, width, height)
+            render = lambda: generate_wordcloud_image(tokens, 'english', width, height, mask=source)
+            
+            prep_uncached = mean_ms(prep, args.renders, clear_cache=True)
+            prep_cached = mean_ms(prep, args.renders, clear_cache=False)
+            mask = get_shape_mask(source, width, height)
+            occupancy = mean_ms(lambda: occupancy_setup(mask), args.renders, clear_cache=False)
+            render_uncached = mean_ms(render, args.renders, clear_cache=True)
+            get_shape_mask(source, width, height)
+            render_cached = mean_ms(render, args.renders, clear_cache=False)
+            
+            print(f"{name:<7} {f'{width}x{height}':>10} {prep_uncached:>9.1f} {prep_cached:>8.3f} "
+                  f"{occupancy:>13.1f} {render_uncached:>10.1f} {render_cached:>8.1f} {render_uncached / render_cached:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark the suffix-stripping normalizer against tokenization.
+
+Usage:
+    python benchmarks/bench_normalizer.py [--tokens 200000] [--types 20000] [--max-ratio 2.0]
+
+For every language with suffix rules, a corpus with a realistic type/token
+ratio is generated: stems are built from the aksharas of the sample text,
+inflected with the language's suffixes, and drawn with Zipf frequencies, with
+the stopwords as the most frequent words. Tokenization is timed against
+merging inflections (normalize_tokens followed by the stemmed stopword
+filter), cold (empty stem memo) and warm. Every distinct form is stemmed
+once, so the cold cost grows with the number of types. Exits with status 1 if
+the cold merge time exceeds max-ratio of the tokenization time.
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+
+import regex
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import (SUFFIX_RULES, clean_text, tokenize_text, normalize_tokens, filter_stopwords,
+                 load_stopwords, stem_token, _stemmed_stopwords)
+from samples import load_sample_texts
+
+def time_call(func, *args, setup=None, runs=3):
+    """Time the fastest of several calls, with garbage collection paused as timeit does.
+    
+    Args:
+        func (callable): Function to time.
+        setup (callable): Called before every run, outside the timing.
+        runs (int): Number of runs.
+    
+    Returns:
+        tuple: (result, elapsed seconds of the fastest run).
+    """
+    best = float('inf')
+    for _ in range(runs):
+        if setup:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return result, best
+
+def clear_memo():
+    """Empty the stemming memos so the next merge starts cold."""
+    stem_token.cache_clear()
+    _stemmed_stopwords.cache_clear()
+
+def build_corpus(sample, lang, tokens, types, seed=0):
+    """Build a text of Zipf-distributed inflected word forms.
+    
+    Args:
+        sample (str): Sample text whose aksharas are used to build stems.
+        lang (str): Language code.
+        tokens (int): Number of tokens in the corpus.
+        types (int): Number of distinct inflected forms to draw from.
+        seed (int): Random seed.
+    
+    Returns:
+        str: Space-separated corpus text.
+    """
+    rng = random.Random(seed)
+    aksharas = sorted(set(regex.findall(r'\X', regex.sub(r'[\s\p{P}]', '', sample))))
+    suffixes = [''] + SUFFIX_RULES[lang]['suffixes']
+    
+    vocabulary = sorted(load_stopwords().get(lang, ()))
+    seen = set(vocabulary)
+    while len(vocabulary) < types:
+        stem = ''.join(rng.choice(aksharas) for _ in range(rng.randint(2, 4)))
+        for suffix in rng.sample(suffixes, min(4, len(suffixes))):
+            if stem + suffix not in seen:
+                seen.add(stem + suffix)
+                vocabulary.append(stem + suffix)
+    
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    return ' '.join(rng.choices(vocabulary, weights=weights, k=tokens))
+
+def merge_inflections(tokens, lang):
+    """Merge inflected forms and remove stopwords by stem, as the app does."""
+    return filter_stopwords(normalize_tokens(tokens, lang), lang, stemmed=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=200000, help="Tokens in each generated corpus.")
+    parser.add_argument('--types', type=int, default=20000, help="Distinct word forms in each corpus.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the corpus.")
+    parser.add_argument('--max-ratio', type=float, default=2.0, help="Allowed cold merge/tokenization time ratio.")
+    args = parser.parse_args()
+    
+    # Keep per-call tokenizer logging out of the measurements
+    logging.getLogger('app').setLevel(logging.WARNING)
+    
+    samples = load_sample_texts()
+    failed = False
+    
+    print(f"{'language':<10} {'tokens':>8} {'types':>7} {'tokenize ms':>12} {'cold ms':>9} {'warm ms':>9} "
+          f"{'cold ratio':>11}")
+    for lang in SUFFIX_RULES:
+        if lang not in samples:
+            continue
+    
+        text = clean_text(build_corpus(samples[lang], lang, args.tokens, args.types, args.seed))
+        tokens, tokenize_time = time_call(tokenize_text, text, lang)
+    
+        _, cold_time = time_call(merge_inflections, tokens, lang, setup=clear_memo)
+        _, warm_time = time_call(merge_inflections, tokens, lang)
+    
+        ratio = cold_time / tokenize_time if tokenize_time else float('inf')
+        failed = failed or ratio > args.max_ratio
+        print(f"{lang:<10} {len(tokens):>8} {len(set(tokens)):>7} {tokenize_time * 1000:>12.2f} "
+              f"{cold_time * 1000:>9.2f} {warm_time * 1000:>9.2f} {ratio:>11.3f}")
+    
+    if failed:
+        print(f"FAIL: merging inflections exceeded {args.max_ratio:.2f} of tokenization time")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
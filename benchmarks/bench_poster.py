@@ -0,0 +1,97 @@
+"""Benchmark poster export time and peak RSS against output resolution.
+
+Usage:
+    python benchmarks/bench_poster.py [--sizes 800x400,2000x1000,4000x2000,8000x4000]
+                                      [--mask heart] [--direct-max-pixels 8000000]
+
+Every measurement runs in its own subprocess so its peak RSS is not inflated by
+earlier runs. Three modes are compared:
+
+    baseline  import the app only
+    direct    generate_wordcloud_image at full resolution (full-size layout grid, BytesIO)
+    poster    export_wordcloud_poster (scaled layout, strips streamed to disk)
+
+Direct renders above --direct-max-pixels are skipped because their layout time
+grows with the full canvas.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def run_child(mode, width, height, mask, memory_limit):
+    """Render once in this process; called in the child subprocess."""
+    import logging
+    from app import clean_text, export_wordcloud_poster, generate_wordcloud_image
+    from samples import load_sample_texts
+    
+    logging.getLogger('app').setLevel(logging.WARNING)
+    tokens = clean_text(' '.join(load_sample_texts().values())).split() * 5
+    
+    if mode == 'direct':
+        result = generate_wordcloud_image(tokens, 'english', width, height, mask=mask)
+    elif mode == 'poster':
+        with tempfile.TemporaryDirectory() as tmp:
+            result = export_wordcloud_poster(tokens, 'english', os.path.join(tmp, 'poster.png'),
+                                             width, height, mask=mask, max_memory_mb=memory_limit)
+    else:
+        result = True
+    
+    return 0 if result else 1
+
+def measure(mode, width, height, mask, memory_limit):
+    """Run one mode in a subprocess.
+    
+    Returns:
+        tuple: (wall seconds, peak RSS in MiB, exit status).
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode,
+               '--sizes', f'{width}x{height}', '--memory-limit', str(memory_limit)]
+    if mask:
+        command += ['--mask', mask]
+    
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return elapsed, peak, os.waitstatus_to_exitcode(status)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='800x400,2000x1000,4000x2000,8000x4000', help="Comma-separated output sizes.")
+    parser.add_argument('--mask', default=None, help="Bundled shape to render (default: rectangle).")
+    parser.add_argument('--memory-limit', type=float, default=256, help="max_memory_mb for poster exports.")
+    parser.add_argument('--direct-max-pixels', type=int, default=8000000, help="Skip direct renders above this.")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    sizes = [tuple(int(n) for n in size.split('x')) for size in args.sizes.split(',')]
+    
+    if args.child:
+        width, height = sizes[0]
+        return run_child(args.child, width, height, args.mask, args.memory_limit)
+    
+    elapsed, peak, _ = measure('baseline', 1, 1, None, args.memory_limit)
+    print(f"baseline (import only): peak RSS {peak:.0f} MiB")
+    print(f"{'mode':<8} {'size':>10} {'time s':>8} {'peak RSS MiB':>13} {'status':>7}")
+    
+    for width, height in sizes:
+        for mode in ('direct', 'poster'):
+            if mode == 'direct' and width * height > args.direct_max_pixels:
+                print(f"{mode:<8} {f'{width}x{height}':>10} {'skipped':>8}")
+                continue
+            elapsed, peak, status = measure(mode, width, height, args.mask, args.memory_limit)
+            print(f"{mode:<8} {f'{width}x{height}':>10} {elapsed:>8.2f} {peak:>13.0f} "
+                  f"{'ok' if status == 0 else 'FAIL':>7}")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""Offline load test for the wordcloud pipeline.
+
+Usage:
+    python benchmarks/loadtest.py [--target pipeline|http|apptest] [--concurrency 8]
+                                  [--requests 400] [--max-p95-ms 2000] [--max-rss-growth-mb 100]
+
+Mixed-language payloads from sample_inputs.md are sent with the given
+concurrency to one of three targets:
+
+    pipeline  call the app.py functions directly from a thread pool
+    http      POST to a local HTTP stand-in server that runs the same pipeline
+    apptest   run app.py as a fresh Streamlit session per request (AppTest)
+
+Latency percentiles, throughput and resident memory sampled over the run are
+reported. Exits with status 1 if any threshold is exceeded.
+"""
+import argparse
+import io
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import (
+    SUFFIX_RULES,
+    clean_text,
+    tokenize_text,
+    normalize_tokens,
+    filter_stopwords,
+    get_frequencies,
+    plot_frequency_bar,
+    generate_wordcloud_image
+)
+from samples import load_sample_texts
+
+# Try to import psutil for RSS sampling, with fallback to /proc
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.py'))
+
+# Get the resident set size of this process
+def current_rss_mb():
+    """Get the current resident set size of this process.
+
+    Returns:
+        float: Resident memory in MiB, or None if it cannot be measured.
+    """
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+class RSSSampler:
+    """Sample resident memory on a background thread."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = []
+        self._start = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = current_rss_mb()
+            if rss is not None:
+                self.samples.append((time.perf_counter() - self._start, rss))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+# Run one request through the same steps as setup_ui
+def run_pipeline(text, lang, top_n=20, merge_inflections=False):
+    """Run the processing steps of one Generate click in setup_ui.
+
+    Args:
+        text (str): Input text.
+        lang (str): Language code.
+        top_n (int): Number of top words.
+        merge_inflections (bool): Merge inflected forms before filtering.
+
+    Returns:
+        bytes: Wordcloud PNG bytes, or None if there were no tokens.
+    """
+    cleaned_text = clean_text(text)
+    tokens = tokenize_text(cleaned_text, lang)
+    if merge_inflections and lang in SUFFIX_RULES:
+        filtered_tokens = filter_stopwords(normalize_tokens(tokens, lang), lang, stemmed=True)
+    else:
+        filtered_tokens = filter_stopwords(tokens, lang)
+    if not filtered_tokens:
+        return None
+
+    freq_list = get_frequencies(filtered_tokens, top_n)
+
+    fig = plot_frequency_bar(freq_list, lang)
+    if fig:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+
+    wordcloud_bytes = generate_wordcloud_image(filtered_tokens, lang)
+    return wordcloud_bytes.getvalue() if wordcloud_bytes else None
+
+class PipelineHandler(BaseHTTPRequestHandler):
+    """Local HTTP stand-in that serves run_pipeline on POST /generate."""
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self.send_error(404)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            body = run_pipeline(payload['text'], payload['lang'], payload.get('top_n', 20),
+                                payload.get('merge_inflections', False)) or b''
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_pipeline_target():
+    """Create a target that calls the pipeline directly."""
+    def send(payload):
+        run_pipeline(payload['text'], payload['lang'], payload['top_n'], payload['merge_inflections'])
+    return send, None
+
+def make_http_target():
+    """Create a target that posts to a local HTTP stand-in server."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PipelineHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+    def send(payload):
+        request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+
+    def close():
+        server.shutdown()
+        server.server_close()
+
+    return send, close
+
+def make_apptest_target():
+    """Create a target that runs app.py as a fresh Streamlit session per request."""
+    from streamlit.testing.v1 import AppTest
+
+    def send(payload):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        at.text_area[0].input(payload['text'])
+        at.selectbox[0].select(payload['lang']).run()
+        at.slider[0].set_value(payload['top_n'])
+        # The merge checkbox is only enabled for languages with suffix rules
+        if payload['lang'] in SUFFIX_RULES:
+            at.checkbox[0].set_value(payload['merge_inflections'])
+        at.button[0].click().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        # setup_ui reports processing errors with st.error instead of raising
+        if at.error:
+            raise RuntimeError(at.error[0].value)
+
+    return send, None
+
+TARGETS = {
+    'pipeline': make_pipeline_target,
+    'http': make_http_target,
+    'apptest': make_apptest_target
+}
+
+def build_payloads(samples, count, max_repeat, merge_ratio, seed):
+    """Build mixed-language payloads of varying size.
+
+    Args:
+        samples (dict): Language codes mapped to sample texts.
+        count (int): Number of payloads.
+        max_repeat (int): Upper bound on how many times a sample text is repeated.
+        merge_ratio (float): Fraction of payloads that merge inflected forms.
+        seed (int): Random seed.
+
+    Returns:
+        list: List of payload dictionaries.
+    """
+    rng = random.Random(seed)
+    languages = sorted(samples)
+    payloads = []
+    for _ in range(count):
+        lang = rng.choice(languages)
+        payloads.append({
+            'text': ' '.join([samples[lang]] * rng.randint(1, max_repeat)),
+            'lang': lang,
+            'top_n': rng.choice([10, 20, 50]),
+            'merge_inflections': rng.random() < merge_ratio
+        })
+    return payloads
+
+def percentile(sorted_values, pct):
+    """Get a nearest-rank percentile from sorted values."""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def check_thresholds(p95, p99, throughput, rss_growth, error_rate, max_p95_ms=None, max_p99_ms=None,
+                     min_throughput=None, max_rss_growth_mb=None, max_error_rate=0.0):
+    """Compare the results of a run with the failure thresholds.
+
+    Args:
+        p95 (float): 95th percentile latency in milliseconds.
+        p99 (float): 99th percentile latency in milliseconds.
+        throughput (float): Completed requests per second.
+        rss_growth (float): RSS growth in MiB over the run, or None if not measured.
+        error_rate (float): Fraction of requests that failed.
+        max_p95_ms (float): Maximum p95 latency, or None for no limit.
+        max_p99_ms (float): Maximum p99 latency, or None for no limit.
+        min_throughput (float): Minimum throughput, or None for no limit.
+        max_rss_growth_mb (float): Maximum RSS growth, or None for no limit.
+        max_error_rate (float): Maximum error fraction.
+
+    Returns:
+        list: Descriptions of the exceeded thresholds, empty if all passed.
+    """
+    failures = []
+    if max_p95_ms is not None and p95 > max_p95_ms:
+        failures.append(f"p95 {p95:.1f}ms > {max_p95_ms}ms")
+    if max_p99_ms is not None and p99 > max_p99_ms:
+        failures.append(f"p99 {p99:.1f}ms > {max_p99_ms}ms")
+    if min_throughput is not None and throughput < min_throughput:
+        failures.append(f"throughput {throughput:.2f} req/s < {min_throughput} req/s")
+    if max_rss_growth_mb is not None and rss_growth is not None and rss_growth > max_rss_growth_mb:
+        failures.append(f"RSS growth {rss_growth:.1f}MiB > {max_rss_growth_mb}MiB")
+    if error_rate > max_error_rate:
+        failures.append(f"error rate {error_rate:.2%} > {max_error_rate:.2%}")
+    return failures
+
+def run_load(send, payloads, concurrency):
+    """Send payloads with the given concurrency.
+
+    Returns:
+        tuple: (sorted latencies in seconds, error count, wall time in seconds).
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(payload):
+        start = time.perf_counter()
+        try:
+            send(payload)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, payloads))
+    wall_time = time.perf_counter() - start
+
+    for error in errors[:3]:
+        print(f"error: {error!r}")
+
+    return sorted(latencies), len(errors), wall_time
+
+def print_rss_timeline(samples, rows=10):
+    """Print up to the given number of evenly spaced RSS samples."""
+    if not samples:
+        print("RSS: not available on this platform")
+        return
+    step = max(1, len(samples) // rows)
+    print(f"{'t (s)':>8} {'RSS (MiB)':>10}")
+    for elapsed, rss in samples[::step] + ([samples[-1]] if (len(samples) - 1) % step else []):
+        print(f"{elapsed:>8.1f} {rss:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=sorted(TARGETS), default='pipeline', help="What to drive.")
+    parser.add_argument('--concurrency', type=int, default=8, help="Number of concurrent clients.")
+    parser.add_argument('--requests', type=int, default=400, help="Number of measured requests.")
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests sent first.")
+    parser.add_argument('--languages', default=None, help="Comma-separated language codes (default: all samples).")
+    parser.add_argument('--max-repeat', type=int, default=20, help="Max times a sample text is repeated per payload.")
+    parser.add_argument('--merge-ratio', type=float, default=0.5, help="Fraction of payloads merging inflections.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for payloads.")
+    parser.add_argument('--sample-interval', type=float, default=0.5, help="Seconds between RSS samples.")
+    parser.add_argument('--max-p95-ms', type=float, default=None, help="Fail if p95 latency exceeds this.")
+    parser.add_argument('--max-p99-ms', type=float, default=None, help="Fail if p99 latency exceeds this.")
+    parser.add_argument('--min-throughput', type=float, default=None, help="Fail if requests/s is below this.")
+    parser.add_argument('--max-rss-growth-mb', type=float, default=None, help="Fail if RSS grows more than this after warmup.")
+    parser.add_argument('--max-error-rate', type=float, default=0.0, help="Fail if the error fraction exceeds this.")
+    args = parser.parse_args()
+
+    # Keep per-call pipeline logging out of the measurements
+    logging.getLogger('app').setLevel(logging.WARNING)
+
+    samples = load_sample_texts()
+    if args.languages:
+        languages = args.languages.split(',')
+        unknown = [lang for lang in languages if lang not in samples]
+        if unknown:
+            parser.error(f"no sample text for {', '.join(unknown)} in sample_inputs.md; "
+                         f"available: {', '.join(sorted(samples))}")
+        samples = {lang: samples[lang] for lang in languages}
+    send, close = TARGETS[args.target]()
+
+    try:
+        warmup_payloads = build_payloads(samples, args.warmup, args.max_repeat, args.merge_ratio, args.seed + 1)
+        run_load(send, warmup_payloads, args.concurrency)
+
+        payloads = build_payloads(samples, args.requests, args.max_repeat, args.merge_ratio, args.seed)
+        sampler = RSSSampler(args.sample_interval)
+        sampler.start()
+        latencies, error_count, wall_time = run_load(send, payloads, args.concurrency)
+        sampler.stop()
+    finally:
+        if close:
+            close()
+
+    p50, p95, p99 = (percentile(latencies, pct) * 1000 for pct in (50, 95, 99))
+    throughput = len(latencies) / wall_time if wall_time else 0.0
+    error_rate = error_count / len(payloads) if payloads else 0.0
+    rss_values = [rss for _, rss in sampler.samples]
+    rss_growth = rss_values[-1] - rss_values[0] if rss_values else None
+
+    print(f"target={args.target} concurrency={args.concurrency} requests={len(payloads)} "
+          f"languages={','.join(sorted(samples))}")
+    print(f"latency ms: p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+    print(f"throughput: {throughput:.2f} req/s over {wall_time:.1f}s, errors: {error_count}")
+    if rss_values:
+        print(f"RSS MiB: start={rss_values[0]:.1f} peak={max(rss_values):.1f} "
+              f"end={rss_values[-1]:.1f} growth={rss_growth:+.1f}")
+    print_rss_timeline(sampler.samples)
+
+    failures = check_thresholds(p95, p99, throughput, rss_growth, error_rate,
+                                max_p95_ms=args.max_p95_ms, max_p99_ms=args.max_p99_ms,
+                                min_throughput=args.min_throughput, max_rss_growth_mb=args.max_rss_growth_mb,
+                                max_error_rate=args.max_error_rate)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Load the sample texts from sample_inputs.md for benchmarks and load tests."""
+import os
+import re
+
+SAMPLE_INPUTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample_inputs.md')
+
+# Section headings in sample_inputs.md mapped to language codes
+SECTION_LANGUAGES = {
+    'English': 'english',
+    'Hindi': 'hindi',
+    'Assamese': 'assamese',
+    'Manipuri': 'manipuri',
+    'Bodo': 'bodo'
+}
+
+def load_sample_texts(path=SAMPLE_INPUTS_PATH):
+    """Load the sample text of every language section in sample_inputs.md.
+    
+    Args:
+        path (str): Path to the sample inputs markdown file.
+        
+    Returns:
+        dict: Dictionary with language codes as keys and sample texts as values.
+    """
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    
+    samples = {}
+    for section in re.split(r'^## ', content, flags=re.MULTILINE)[1:]:
+        heading = section.split('\n', 1)[0].strip()
+        lang = SECTION_LANGUAGES.get(heading.split(' ')[0])
+        match = re.search(r'### Sample Text\s*```\n(.*?)\n```', section, flags=re.DOTALL)
+        if lang and match:
+            samples[lang] = match.group(1).strip()
+    
+    return samples
@@ -2,6 +2,8 @@ import sys
 import os
 import pytest
 from io import BytesIO
+import matplotlib.pyplot as plt
+from PIL import Image
 
 # Add parent directory to path to import app.py
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,7 +15,13 @@ from app import (
     filter_stopwords,
     get_frequencies,
     generate_wordcloud_image,
-    load_stopwords
+    export_wordcloud_poster,
+    PeakMemory,
+    plot_frequency_bar,
+    get_shape_mask,
+    load_stopwords,
+    stem_token,
+    normalize_tokens
 )
 
 # Test text cleaning
@@ -96,6 +104,70 @@ def test_stopwords_removed():
     # Test with empty input
     assert filter_stopwords([], "english") == []
 
+# Test suffix stripping
+def test_stem_token():
+    # Stacked Manipuri suffixes are peeled off one at a time
+    assert stem_token("ꯑꯗꯣꯝꯗꯒꯤꯁꯨ", "manipuri") == "ꯑꯗꯣꯝ"
+    assert stem_token("ꯁꯥꯏꯟꯁꯅ", "manipuri") == "ꯁꯥꯏꯟꯁ"
+    assert stem_token("কিতাপখনত", "assamese") == "কিতাপ"
+    
+    # Stems are never shorter than two characters
+    assert stem_token("ꯑꯗꯨ", "manipuri") == "ꯑꯗꯨ"
+    
+    # Languages without rules are left untouched
+    assert stem_token("testing", "english") == "testing"
+
+# Test merging of inflected forms
+def test_normalize_tokens():
+    tokens = ["ꯁꯥꯏꯟꯁ", "ꯁꯥꯏꯟꯁꯅ", "ꯁꯥꯏꯟꯁ", "ꯗꯥꯇꯥ"]
+    normalized = normalize_tokens(tokens, "manipuri")
+    
+    # Inflections map to the most frequent surface form
+    assert normalized == ["ꯁꯥꯏꯟꯁ", "ꯁꯥꯏꯟꯁ", "ꯁꯥꯏꯟꯁ", "ꯗꯥꯇꯥ"]
+    assert get_frequencies(normalized, top_n=1) == [("ꯁꯥꯏꯟꯁ", 3)]
+    
+    # Test with empty input
+    assert normalize_tokens([], "manipuri") == []
+
+# Test stopword matching by stem
+def test_stopwords_removed_by_stem():
+    # Inflected form missing from the enumerated stopword list
+    tokens = ["ꯑꯗꯣꯝꯁꯤꯡꯅ", "ꯗꯥꯇꯥ"]
+    assert "ꯑꯗꯣꯝꯁꯤꯡꯅ" in filter_stopwords(tokens, "manipuri")
+    assert filter_stopwords(tokens, "manipuri", stemmed=True) == ["ꯗꯥꯇꯥ"]
+
+# Test that short Hindi content words are not over-stemmed into stopwords
+def test_stopwords_kept_by_stem():
+    # सेना, कला, परी would otherwise be cut to the stopwords से, कल, पर
+    tokens = ["सेना", "कला", "परी", "भागना"]
+    assert filter_stopwords(tokens, "hindi", stemmed=True) == tokens
+    
+    # Stems keep at least two syllables; a final bare consonant is silent
+    assert stem_token("कला", "hindi") == "कला"
+    assert stem_token("किताबों", "hindi") == "किताब"
+    assert normalize_tokens(["कल", "कल", "कला"], "hindi") == ["कल", "कल", "कला"]
+
+# Test that a final conjunct counts as a syllable when stemming
+def test_stem_conjunct_final():
+    assert stem_token("बच्चों", "hindi") == "बच्च"
+    assert stem_token("मित्रों", "hindi") == "मित्र"
+    assert stem_token("राष्ट्रों", "hindi") == "राष्ट्र"
+    assert stem_token("ৰাজ্যত", "assamese") == "ৰাজ্য"
+    
+    # Inflections of the same word merge into its most frequent form
+    tokens = ["बच्चा", "बच्चे", "बच्चों", "बच्चा"]
+    assert normalize_tokens(tokens, "hindi") == ["बच्चा"] * 4
+
+# Test Bodo suffix stripping and stopwords
+def test_stem_token_bodo():
+    assert stem_token("डेटानिफ्राय", "bodo") == "डेटा"
+    assert stem_token("मानसिफोरखौ", "bodo") == "मानसि"
+    assert stem_token("गामियाव", "bodo") == "गामि"
+    
+    tokens = ["डेटा", "डेटाखौ", "डेटानि", "आरो", "जोंखौ"]
+    assert normalize_tokens(tokens, "bodo")[:3] == ["डेटा"] * 3
+    assert filter_stopwords(normalize_tokens(tokens, "bodo"), "bodo", stemmed=True) == ["डेटा"] * 3
+
 # Test word frequency counting
 def test_word_frequencies():
     tokens = ["apple", "banana", "apple", "cherry", "banana", "apple"]
@@ -134,6 +206,92 @@ def test_wordcloud_generate():
     # Test with empty input
     assert generate_wordcloud_image([], "english") is None
 
+# Test shaped wordcloud generation
+def test_wordcloud_generate_shaped():
+    tokens = ["data", "science", "python", "machine", "learning", 
+              "artificial", "intelligence", "data", "science", "data"]
+    
+    wordcloud_bytes = generate_wordcloud_image(tokens, "english", mask="circle", contour_width=3)
+    assert isinstance(wordcloud_bytes, BytesIO)
+    assert len(wordcloud_bytes.getvalue()) > 0
+    
+    # Unknown shapes are reported as a failed render
+    assert generate_wordcloud_image(tokens, "english", mask="unknown") is None
+
+# Test mask caching
+def test_shape_mask_cached():
+    mask = get_shape_mask("heart", 200, 100)
+    
+    # Mask matches the canvas and words can only go inside the shape
+    assert mask.shape == (100, 200)
+    assert mask[0, 0] == 255 and mask[50, 100] == 0
+    
+    # Same (mask, size) reuses the cached result; other sizes do not
+    assert get_shape_mask("heart", 200, 100) is mask
+    assert get_shape_mask("heart", 400, 200) is not mask
+    
+    # Uploads are keyed by content, not by the bytes object
+    buf = BytesIO()
+    Image.new("L", (50, 50), 0).save(buf, format="PNG")
+    upload = get_shape_mask(buf.getvalue(), 200, 100)
+    assert get_shape_mask(bytes(bytearray(buf.getvalue())), 200, 100) is upload
+    assert upload[50, 100] == 0 and upload[50, 0] == 255
+
+# Test poster export
+def test_export_wordcloud_poster(tmp_path):
+    tokens = ["data", "science", "python", "machine", "learning", 
+              "artificial", "intelligence", "data", "science", "data"]
+    path = str(tmp_path / "poster.png")
+    
+    # A tight memory limit forces the poster to be rendered in several strips,
+    # and the measured memory stays within it
+    with PeakMemory() as memory:
+        result = export_wordcloud_poster(tokens, "english", path, 4800, 2400, mask="circle",
+                                         contour_width=9, max_memory_mb=30)
+    assert result == path
+    assert memory.peak_mb is None or memory.peak_mb <= 30
+    
+    result = export_wordcloud_poster(tokens, "english", path, 2400, 1200, mask="circle",
+                                     contour_width=9, max_memory_mb=30)
+    assert result == path
+    
+    with Image.open(path) as img:
+        img.load()
+        assert img.size == (2400, 1200)
+        assert img.mode == "RGB"
+    
+    # Tall posters get a layout grid scaled down on both axes, so they fit the
+    # same limit as wide ones
+    result = export_wordcloud_poster(tokens, "english", path, 600, 2400, mask="heart",
+                                     max_memory_mb=30)
+    assert result == path
+    with Image.open(path) as img:
+        img.load()
+        assert img.size == (600, 2400)
+    
+    # Limits too low for a single row are refused
+    assert export_wordcloud_poster(tokens, "english", path, 2400, 1200, max_memory_mb=1) is None
+    
+    # Test with empty input
+    assert export_wordcloud_poster([], "english", path) is None
+
+# Test frequency bar chart
+def test_plot_frequency_bar():
+    open_figures = len(plt.get_fignums())
+    fig = plot_frequency_bar([("data", 3), ("science", 2)], "english")
+    
+    # Check that we got a figure that can be saved
+    assert fig is not None
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    assert len(buf.getvalue()) > 0
+    
+    # Figures must not be left open in pyplot's registry
+    assert len(plt.get_fignums()) == open_figures
+    
+    # Test with empty input
+    assert plot_frequency_bar([], "english") is None
+
 # Test stopwords loading
 def test_stopwords_loading():
     stopword_dict = load_stopwords()
@@ -143,14 +301,21 @@ def test_stopwords_loading():
     assert "hindi" in stopword_dict
     assert "assamese" in stopword_dict
     assert "manipuri" in stopword_dict
+    assert "bodo" in stopword_dict
     
     # Check that each language has a non-empty set of stopwords
     assert len(stopword_dict["english"]) > 0
     assert len(stopword_dict["hindi"]) > 0
     assert len(stopword_dict["assamese"]) > 0
     assert len(stopword_dict["manipuri"]) > 0
+    assert len(stopword_dict["bodo"]) > 0
     
     # Check some specific stopwords
     assert "the" in stopword_dict["english"]
     assert "और" in stopword_dict["hindi"]
-    assert "আৰু" in stopword_dict["assamese"]
\ No newline at end of file
+    assert "আৰু" in stopword_dict["assamese"]
+    
+    # Check that the cached stopwords cannot be modified by callers
+    assert isinstance(stopword_dict["english"], frozenset)
+    with pytest.raises(TypeError):
+        stopword_dict["english"] = set()
\ No newline at end of file
@@ -0,0 +1,65 @@
+import sys
+import os
+import math
+
+# Add benchmarks directory to path to import loadtest.py and its samples module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from loadtest import percentile, build_payloads, check_thresholds
+
+# Test nearest-rank percentiles
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    
+    # The rank rounds up, so small samples report the slower value
+    assert percentile([10, 20, 30, 40, 50, 60, 70, 80, 90, 1000], 95) == 1000
+    assert percentile([10, 20, 30], 50) == 20
+    assert percentile([7], 99) == 7
+    assert math.isnan(percentile([], 50))
+
+# Test payload generation
+def test_build_payloads():
+    samples = {"english": "data science", "hindi": "डेटा विज्ञान"}
+    payloads = build_payloads(samples, 50, 3, 0.5, seed=1)
+    
+    assert len(payloads) == 50
+    assert {payload["lang"] for payload in payloads} == {"english", "hindi"}
+    for payload in payloads:
+        repeats = payload["text"].split(" ").count(samples[payload["lang"]].split(" ")[0])
+        assert 1 <= repeats <= 3
+        assert payload["top_n"] in (10, 20, 50)
+    
+    # The same seed gives the same payloads
+    assert payloads == build_payloads(samples, 50, 3, 0.5, seed=1)
+    
+    # The merge ratio bounds the fraction of merging payloads
+    assert not any(payload["merge_inflections"] for payload in build_payloads(samples, 20, 1, 0.0, seed=1))
+    assert all(payload["merge_inflections"] for payload in build_payloads(samples, 20, 1, 1.0, seed=1))
+
+# Test load test failure thresholds
+def test_check_thresholds():
+    results = dict(p95=120.0, p99=300.0, throughput=5.0, rss_growth=40.0, error_rate=0.0)
+    
+    # No limits set and no errors
+    assert check_thresholds(**results) == []
+    
+    # Limits that the results meet
+    assert check_thresholds(**results, max_p95_ms=120, max_p99_ms=300, min_throughput=5,
+                            max_rss_growth_mb=40) == []
+    
+    # Each exceeded limit is reported
+    failures = check_thresholds(**results, max_p95_ms=100, max_p99_ms=200, min_throughput=10,
+                                max_rss_growth_mb=20)
+    assert len(failures) == 4
+    assert failures[0].startswith("p95")
+    assert failures[1].startswith("p99")
+    assert failures[2].startswith("throughput")
+    assert failures[3].startswith("RSS growth")
+    
+    # Any error fails by default, and unmeasured RSS is not a failure
+    results.update(error_rate=0.01, rss_growth=None)
+    assert check_thresholds(**results, max_rss_growth_mb=20) == ["error rate 1.00% > 0.00%"]
+    assert check_thresholds(**results, max_error_rate=0.05) == []